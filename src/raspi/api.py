@@ -3,6 +3,7 @@ import uvicorn
 from functions.database import DataBase
 from contextlib import asynccontextmanager
 from fastapi.middleware.cors import CORSMiddleware
+from pydantic import BaseModel
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
@@ -18,43 +19,74 @@ async def lifespan(app: FastAPI):
 app = FastAPI(lifespan=lifespan)
 
 
+# Declared response models let FastAPI serialize straight to JSON bytes through Pydantic
+class Highscore(BaseModel):
+    Teamname: str
+    Punkte: int
+    Zeitpunkt: str
+
+
+class Leaderboard(BaseModel):
+    Highscores: list[Highscore]
+
+
+class Stats(BaseModel):
+    Daily: int
+    Weekly: int
+    Monthly: int
+    AllTime: int
+
+
+# The leaderboard frontend is served from the local network
+ALLOWED_ORIGIN_REGEX = r"https?://(localhost|127\.0\.0\.1|192\.168\.\d{1,3}\.\d{1,3}|10\.\d{1,3}\.\d{1,3}\.\d{1,3}|[\w-]+\.local)(:\d+)?"
+
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=["*"],
-    allow_methods=["*"],
-    allow_headers=["*"],
+    allow_origin_regex=ALLOWED_ORIGIN_REGEX,
+    allow_methods=["GET"],
 )
-@app.get("/best")
+@app.get("/best", response_model=Leaderboard)
 def return_highscores():
     """Returns the top 10 scores of all time."""
-    return app.state.db.get_best_alltime()
+    return app.state.db.get_snapshot("best_alltime")
 
 
-@app.get("/best-today")
+@app.get("/best-today", response_model=Leaderboard)
 def return_best_today():
     """Returns the top 10 scores from today."""
-    return app.state.db.get_best_date(days_ago=0, offset=0)
+    return app.state.db.get_snapshot("best_today")
 
 
-@app.get("/best-weekly")
+@app.get("/best-weekly", response_model=Leaderboard)
 def return_best_weekly():
     """Returns the top 10 scores from the last 7 days."""
-    return app.state.db.get_best_date(days_ago=7, offset=0)
+    return app.state.db.get_snapshot("best_weekly")
 
 
-@app.get("/best-monthly")
+@app.get("/best-monthly", response_model=Leaderboard)
 def return_best_monthly():
     """Returns the top 10 scores from the last 31 days."""
-    # Changed offset from 10 to 0, as 10 seemed like a typo
-    return app.state.db.get_best_date(days_ago=31, offset=0)
+    return app.state.db.get_snapshot("best_monthly")
 
 
-@app.get("/stats")
+@app.get("/stats", response_model=Stats)
 def return_stats():
     """Returns game count statistics."""
-    return app.state.db.get_stats()
+    return app.state.db.get_snapshot("stats")
 
 
 if __name__ == "__main__":
-    uvicorn.run("api:app", host="0.0.0.0",port=50312, reload=True)
+    # Create and migrate the schema once before the workers start, so they only ever open
+    # an up-to-date database (migrate_timestamps is also safe to race with the game)
+    DataBase().close()
+    # Each worker opens its own DataBase in lifespan(); WAL lets them read concurrently
+    uvicorn.run(
+        "api:app",
+        host="0.0.0.0",
+        port=50312,
+        loop="uvloop",
+        http="httptools",
+        workers=2,
+        log_level="warning",
+    )
 
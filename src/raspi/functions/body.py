@@ -1,79 +1,102 @@
 import pygame
-from pygame.math import Vector2
+from collections import deque
+from functools import lru_cache
 from .get_asset_path import get_asset_path
 import json
 
+
+@lru_cache(maxsize=None)
+def load_sprite(path):
+    """Loads a snake sprite once per process; reset_game creates a new SNAKE every round."""
+    return pygame.image.load(get_asset_path(path)).convert_alpha()
+
+
 class SNAKE:
     def __init__(self ,screen, cell_size):
         self.screen = screen 
         self.cell_size = cell_size
-        self.body = [Vector2(7,10), Vector2(6,10), Vector2(5,10)]
-        self.direction = Vector2(1,0)
+        # Segments are (x, y) int tuples, head first, in a deque so a move is O(1) at both ends;
+        # occupied holds the same cells so self collision is a set lookup instead of a scan
+        self.body = deque([(7, 10), (6, 10), (5, 10)])
+        self.occupied = set(self.body)
+        self.self_collision = False
+        self.direction = (1, 0)
         self.new_block = False
         
 
 
-        self.head_up     = pygame.image.load(get_asset_path('assets/head_up.png')).convert_alpha()
-        self.head_down   = pygame.image.load(get_asset_path('assets/head_down.png')).convert_alpha()
-        self.head_right  = pygame.image.load(get_asset_path('assets/head_right.png')).convert_alpha()
-        self.head_left   = pygame.image.load(get_asset_path('assets/head_left.png')).convert_alpha()
-        self.tail_up     = pygame.image.load(get_asset_path('assets/tail_up.png')).convert_alpha()
-        self.tail_down   = pygame.image.load(get_asset_path('assets/tail_down.png')).convert_alpha()
-        self.tail_right  = pygame.image.load(get_asset_path('assets/tail_right.png')).convert_alpha()
-        self.tail_left   = pygame.image.load(get_asset_path('assets/tail_left.png')).convert_alpha()
-        self.body_vertical   = pygame.image.load(get_asset_path('assets/body_vertical.png')).convert_alpha()
-        self.body_horizontal = pygame.image.load(get_asset_path('assets/body_horizontal.png')).convert_alpha()
-        self.body_tr = pygame.image.load(get_asset_path('assets/body_tr.png')).convert_alpha()
-        self.body_tl = pygame.image.load(get_asset_path('assets/body_tl.png')).convert_alpha()
-        self.body_br = pygame.image.load(get_asset_path('assets/body_br.png')).convert_alpha()
-        self.body_bl = pygame.image.load(get_asset_path('assets/body_bl.png')).convert_alpha()
+        self.head_up     = load_sprite('assets/head_up.png')
+        self.head_down   = load_sprite('assets/head_down.png')
+        self.head_right  = load_sprite('assets/head_right.png')
+        self.head_left   = load_sprite('assets/head_left.png')
+        self.tail_up     = load_sprite('assets/tail_up.png')
+        self.tail_down   = load_sprite('assets/tail_down.png')
+        self.tail_right  = load_sprite('assets/tail_right.png')
+        self.tail_left   = load_sprite('assets/tail_left.png')
+        self.body_vertical   = load_sprite('assets/body_vertical.png')
+        self.body_horizontal = load_sprite('assets/body_horizontal.png')
+        self.body_tr = load_sprite('assets/body_tr.png')
+        self.body_tl = load_sprite('assets/body_tl.png')
+        self.body_br = load_sprite('assets/body_br.png')
+        self.body_bl = load_sprite('assets/body_bl.png')
         self.head = self.head_right
         self.tail = self.tail_left
 
 
 
-    def draw_snake(self):
+    def draw_snake(self, cells=None):
+        """Draws the snake; if cells is given, only the segments on those cells."""
         self.update_head_graphics()
         self.update_tail_graphics()
-        for i, b in enumerate(self.body):
-            x = int(b.x * self.cell_size)
-            y = int(b.y * self.cell_size)
-            r = pygame.Rect(x, y, self.cell_size, self.cell_size)
+        cs = self.cell_size
+        body = list(self.body)  # Indexing into the middle of a deque is O(n)
+        last = len(body) - 1
+        # Segments are collected first and handed to SDL in a single blits() call
+        blits_seq = []
+        for i, b in enumerate(body):
+            if cells is not None and b not in cells:
+                continue
             if i == 0:
-                self.screen.blit(self.head, r)
-            elif i == len(self.body)-1:
-                self.screen.blit(self.tail, r)
+                surf = self.head
+            elif i == last:
+                surf = self.tail
             else:
-                prev = self.calculate_relative(b, self.body[i+1])
-                nxt  = self.calculate_relative(b, self.body[i-1])
-                if prev.x == nxt.x:
-                    self.screen.blit(self.body_vertical, r)
-                elif prev.y == nxt.y:
-                    self.screen.blit(self.body_horizontal, r)
+                prev = self.calculate_relative(b, body[i+1])
+                nxt  = self.calculate_relative(b, body[i-1])
+                if prev[0] == nxt[0]:
+                    surf = self.body_vertical
+                elif prev[1] == nxt[1]:
+                    surf = self.body_horizontal
                 else:
-                    if (prev.x,prev.y) in [(-1,0),(0,-1)] and (nxt.x,nxt.y) in [(-1,0),(0,-1)]:
-                        self.screen.blit(self.body_tl, r)
-                    elif (prev.x,prev.y) in [(-1,0),(0,1)] and (nxt.x,nxt.y) in [(-1,0),(0,1)]:
-                        self.screen.blit(self.body_bl, r)
-                    elif (prev.x,prev.y) in [(1,0),(0,-1)] and (nxt.x,nxt.y) in [(1,0),(0,-1)]:
-                        self.screen.blit(self.body_tr, r)
+                    if prev in [(-1,0),(0,-1)] and nxt in [(-1,0),(0,-1)]:
+                        surf = self.body_tl
+                    elif prev in [(-1,0),(0,1)] and nxt in [(-1,0),(0,1)]:
+                        surf = self.body_bl
+                    elif prev in [(1,0),(0,-1)] and nxt in [(1,0),(0,-1)]:
+                        surf = self.body_tr
                     else:
-                        self.screen.blit(self.body_br, r)
+                        surf = self.body_br
+            blits_seq.append((surf, (b[0] * cs, b[1] * cs)))
+        self.screen.blits(blits_seq, doreturn=False)
 
 
     def move_snake(self, cell_num_x, cell_num_y):
-        c = self.body[:] if self.new_block else self.body[:-1]
-    
-
-        temp_vector = c[0] + self.direction
-        temp_vector.x = temp_vector.x % cell_num_x
-        temp_vector.y = temp_vector.y % cell_num_y
-
-
-        c.insert(0, temp_vector)
-
-        self.body = c
+        """Moves the snake one cell and returns the cell the tail left, or None while growing."""
+        vacated = None
+        if not self.new_block:
+            vacated = self.body.pop()
+            self.occupied.discard(vacated)
+
+        hx, hy = self.body[0]
+        dx, dy = self.direction
+        new_head = ((hx + dx) % cell_num_x, (hy + dy) % cell_num_y)
+
+        # The tail has already moved on, so only the remaining segments count
+        self.self_collision = new_head in self.occupied
+        self.occupied.add(new_head)
+        self.body.appendleft(new_head)
         self.new_block = False
+        return vacated
 
 
 
@@ -84,13 +107,13 @@ class SNAKE:
     def update_head_graphics(self):
         rel = self.calculate_relative(self.body[0], self.body[1])
 
-        if rel == Vector2(1, 0):  
+        if rel == (1, 0):  
             self.head = self.head_left
-        elif rel == Vector2(-1, 0): 
+        elif rel == (-1, 0): 
             self.head = self.head_right
-        elif rel == Vector2(0, 1):
+        elif rel == (0, 1):
             self.head = self.head_up
-        elif rel == Vector2(0, -1):
+        elif rel == (0, -1):
             self.head = self.head_down
         else:
             self.head = self.head_down
@@ -99,35 +122,36 @@ class SNAKE:
     def update_tail_graphics(self):
         rel = self.calculate_relative(self.body[-1], self.body[-2])
 
-        if rel == Vector2(1, 0):  
+        if rel == (1, 0):  
             self.tail = self.tail_left
-        elif rel == Vector2(-1, 0): 
+        elif rel == (-1, 0): 
             self.tail = self.tail_right
-        elif rel == Vector2(0, 1): 
+        elif rel == (0, 1): 
             self.tail = self.tail_up
-        elif rel == Vector2(0, -1):
+        elif rel == (0, -1):
             self.tail = self.tail_down
         else:
             self.tail = self.tail_down
             pass
 
-    def calculate_relative(self, vec1:Vector2, vec2:Vector2)->Vector2:
-        rel = vec2 - vec1
+    def calculate_relative(self, vec1, vec2):
+        dx = vec2[0] - vec1[0]
+        dy = vec2[1] - vec1[1]
 
-        if rel.x > 1:
-            rel.x = -1
-        elif rel.x < - 1:
-            rel.x = 1
+        if dx > 1:
+            dx = -1
+        elif dx < - 1:
+            dx = 1
 
-        if rel.y > 1:
-            rel.y = -1
-        elif rel.y < -1:
-            rel.y = 1
+        if dy > 1:
+            dy = -1
+        elif dy < -1:
+            dy = 1
 
-        return rel
+        return (dx, dy)
 
 
     def get_body_as_json(self):
-        positions = [(int(seg.x), int(seg.y)) for seg in self.body]
+        positions = list(self.body)
         return json.dumps({"snake": positions})
 
@@ -1,113 +1,347 @@
+import queue
 import sqlite3
-from datetime import datetime
+import threading
+import time
+from datetime import date, datetime, timedelta
 
 DB_NAME = "Leaderboard.db"
+# Maximum number of queued scores committed in one transaction by the writer thread
+WRITE_BATCH_SIZE = 32
+
+# SQL is kept in constants so identical strings hit sqlite3's prepared statement cache
+# Zeitpunkt is stored as unix epoch seconds so range filters can use idx_date_score
+SQL_CREATE = "CREATE TABLE IF NOT EXISTS Highscores (Teamname TEXT, Punkte INTEGER, Zeitpunkt INTEGER)"
+# WAL lets the API read a consistent snapshot while the game is writing a score.
+# The memory-mapped file plus the page cache keep the whole (small) database in RAM.
+PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA cache_size=-20000",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA mmap_size=67108864",
+    # Keep modified pages in the page cache until commit instead of spilling them to disk
+    "PRAGMA cache_spill=OFF",
+)
+SQL_DATA_VERSION = "PRAGMA data_version"
+SQL_COLUMNS = "PRAGMA table_info(Highscores)"
+# Converts databases from the old 'YYYY-MM-DD HH:MM:SS' local time TEXT column.
+# Run inside one BEGIN IMMEDIATE transaction; values that are already integers are copied unchanged
+SQL_MIGRATE_TIMESTAMPS = (
+    "ALTER TABLE Highscores RENAME TO Highscores_text",
+    SQL_CREATE.replace(" IF NOT EXISTS", ""),
+    """INSERT INTO Highscores
+        SELECT Teamname, Punkte,
+            CASE WHEN typeof(Zeitpunkt) = 'text'
+                THEN CAST(strftime('%s', Zeitpunkt, 'utc') AS INTEGER)
+                ELSE Zeitpunkt END
+        FROM Highscores_text""",
+    "DROP TABLE Highscores_text",
+)
+# Covering index: the top-10 queries read Teamname, Punkte and Zeitpunkt straight off the index
+SQL_INDEX_SCORE = "CREATE INDEX IF NOT EXISTS idx_score_date ON Highscores(Punkte DESC, Zeitpunkt, Teamname)"
+SQL_INDEX_DATE = "CREATE INDEX IF NOT EXISTS idx_date_score ON Highscores(Zeitpunkt, Punkte DESC)"
+SQL_INSERT = "INSERT INTO Highscores VALUES(?,?,?)"
+SQL_IN_TOP10 = "SELECT Punkte FROM Highscores ORDER BY Punkte DESC LIMIT 1 OFFSET 9"
+SQL_TOP = "SELECT MAX(Punkte) FROM Highscores"
+# All four leaderboards in one statement; each row is tagged with the board it belongs to.
+# Zeitpunkt is returned in the original local time text format
+SQL_SELECT_BOARD = "SELECT ?, Teamname, Punkte, datetime(Zeitpunkt, 'unixepoch', 'localtime') FROM Highscores"
+SQL_BEST_BOARDS = (
+    "SELECT * FROM (" + SQL_SELECT_BOARD + " ORDER BY Punkte DESC LIMIT 10)"
+    + (" UNION ALL SELECT * FROM (" + SQL_SELECT_BOARD + " WHERE Zeitpunkt >= ? ORDER BY Punkte DESC LIMIT 10)") * 3
+)
+# Each count is a range seek on idx_date_score instead of one CASE per row
+SQL_STATS = """
+    SELECT
+        (SELECT COUNT(*) FROM Highscores),
+        (SELECT COUNT(*) FROM Highscores WHERE Zeitpunkt >= ?),
+        (SELECT COUNT(*) FROM Highscores WHERE Zeitpunkt >= ?),
+        (SELECT COUNT(*) FROM Highscores WHERE Zeitpunkt >= ?)
+"""
+
+# Served by get_snapshot while the stats have never been read successfully
+EMPTY_STATS = {"Daily": 0, "Weekly": 0, "Monthly": 0, "AllTime": 0}
+
+
+def day_start(days_ago: int) -> int:
+    """Returns the unix timestamp of local midnight, days_ago days before today."""
+    start = (datetime.now() - timedelta(days=days_ago)).replace(hour=0, minute=0, second=0, microsecond=0)
+    return int(start.timestamp())
 
 class DataBase:
     def __init__(self):
+        # Leaderboard results served to the API, rebuilt only when the data changes
+        self.lock = threading.RLock()
+        self._snapshot = {}
+        self._snapshot_version = None
+        # 10th-place score, or None while fewer than 10 scores exist, and the data_version it was read at
+        self._cutoff_score = None
+        self._cutoff_version = None
+        # Scores waiting for the writer thread, which commits them on its own connection
+        self._write_q = queue.Queue()
+        self._writer_thread = None
         try:
-            self.conn = sqlite3.connect(DB_NAME, check_same_thread=False)
-            self.conn.row_factory = sqlite3.Row
+            self.conn = sqlite3.connect(DB_NAME, check_same_thread=False, cached_statements=256)
+            self.apply_pragmas(self.conn)
             self.cur = self.conn.cursor()
-            self.cur.execute(
-                "CREATE TABLE IF NOT EXISTS Highscores (Teamname TEXT, Punkte INTEGER, Zeitpunkt TEXT)"
-            )
+            self.cur.execute(SQL_CREATE)
+            self.migrate_timestamps()
+            self.cur.execute(SQL_INDEX_SCORE)
+            self.cur.execute(SQL_INDEX_DATE)
             self.conn.commit()
+            # Reads go through a read-only connection, which never takes a write lock
+            self.conn_ro = sqlite3.connect(
+                f"file:{DB_NAME}?mode=ro", uri=True, check_same_thread=False, cached_statements=256
+            )
+            self.apply_pragmas(self.conn_ro)
+            self.cur_ro = self.conn_ro.cursor()
+            self._writer_thread = threading.Thread(target=self._writer_loop, name="highscore-writer", daemon=True)
+            self._writer_thread.start()
         except sqlite3.Error as e:
             print(f"Error connecting to database {DB_NAME}: {e}")
             self.conn = None
             self.cur = None
+            self.conn_ro = None
+            self.cur_ro = None
+
+    def apply_pragmas(self, conn):
+        """Applies the connection tuning PRAGMAs, skipping any the platform rejects."""
+        for pragma in PRAGMAS:
+            try:
+                conn.execute(pragma)
+            except sqlite3.Error as e:
+                print(f"Warning: {pragma} failed: {e}")
+
+    def has_text_timestamps(self):
+        """Returns whether Zeitpunkt still has the old TEXT column type."""
+        columns = {row[1]: row[2] for row in self.cur.execute(SQL_COLUMNS)}
+        return columns.get("Zeitpunkt", "").upper() == "TEXT"
+
+    def migrate_timestamps(self):
+        """
+        Converts a Zeitpunkt TEXT column from older databases to unix timestamps.
+        The game and every API worker run this at startup, so the column type is checked
+        again after taking the write lock; only the first process migrates.
+        """
+        if not self.has_text_timestamps():
+            return
+
+        self.conn.commit()
+        self.cur.execute("BEGIN IMMEDIATE")
+        try:
+            if not self.has_text_timestamps():
+                self.conn.rollback()
+                return
+            for statement in SQL_MIGRATE_TIMESTAMPS:
+                self.cur.execute(statement)
+            self.conn.commit()
+        except sqlite3.Error:
+            self.conn.rollback()
+            raise
+        print("Migrated Highscores.Zeitpunkt to unix timestamps.")
+
+    def _refresh_cutoff(self, version):
+        """Reads the current 10th-place score from the score index and remembers the data_version."""
+        row = self.cur_ro.execute(SQL_IN_TOP10).fetchone()
+        self._cutoff_score = row[0] if row else None
+        self._cutoff_version = version
+
+    def _writer_loop(self):
+        """
+        Commits queued scores in batches until close() sends None.
+        Every queued item is marked done even if it could not be written, so flush() never hangs.
+        """
+        try:
+            conn = sqlite3.connect(DB_NAME, cached_statements=256)
+            self.apply_pragmas(conn)
+        except Exception as e:
+            print(f"Error opening writer connection to {DB_NAME}: {e}")
+            conn = None
+        running = True
+        while running:
+            # Block for the first score, then take whatever else is already queued
+            batch = [self._write_q.get()]
+            while len(batch) < WRITE_BATCH_SIZE:
+                try:
+                    batch.append(self._write_q.get_nowait())
+                except queue.Empty:
+                    break
+            running = None not in batch
+            rows = [row for row in batch if row is not None]
+
+            try:
+                if rows and conn is None:
+                    print(f"Error appending team: no database connection, dropped {len(rows)} score(s)")
+                elif rows:
+                    self._insert_rows(conn, rows)
+            except Exception as e:
+                print(f"Error appending team: {e}")
+            finally:
+                for _ in batch:
+                    self._write_q.task_done()
+        if conn:
+            conn.close()
+
+    def _insert_rows(self, conn, rows):
+        """Inserts the rows with one executemany and one commit."""
+        conn.executemany(SQL_INSERT, rows)
+        conn.commit()
+
+    def flush(self):
+        """
+        Blocks until every score passed to append_team is committed.
+        Not used on the game's paths, which must never wait for a commit.
+        """
+        # Without a running writer nothing would ever mark the queue done
+        if self._writer_thread and self._writer_thread.is_alive():
+            self._write_q.join()
 
     def close(self):
-        """Closes the database connection."""
+        """Commits pending scores and closes the database connection."""
+        if self._writer_thread:
+            self._write_q.put(None)
+            self._writer_thread.join()
+            self._writer_thread = None
+        if self.conn_ro:
+            self.conn_ro.close()
         if self.conn:
             self.conn.close()
             print("Database connection closed.")
 
-    def append_team(self, teamname, score):
-        """Appends a new team score to the database."""
-        if not self.cur: return
-        
+    def get_version(self):
+        """
+        Returns a token that changes whenever the Highscores data changes.
+        This is SQLite's data_version on the read-only connection, which changes
+        with every commit from any other connection (the writer thread, the game process).
+        """
+        if not self.cur_ro: return None
+
         try:
-            finished_at = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-            self.cur.execute(
-                "INSERT INTO Highscores VALUES(?,?,?)", (teamname, score, finished_at)
-            )
-            self.conn.commit()
+            return self.cur_ro.execute(SQL_DATA_VERSION).fetchone()[0]
         except sqlite3.Error as e:
-            print(f"Error appending team: {e}")
+            print(f"Error reading data version: {e}")
+            return None
+
+    def _refresh_snapshot(self):
+        """
+        Runs the leaderboard queries once and stores their results.
+        Returns False and keeps the previous snapshot if a query failed, so the next request retries.
+        """
+        with self.lock:
+            # Read the version first, so a commit during the refresh triggers another one
+            version = (self.get_version(), date.today())
+            if version[0] is None:
+                return False
+            boards = self.get_best_boards()
+            stats = self.get_stats()
+            if boards is None or stats is None:
+                return False
+            boards["stats"] = stats
+            self._snapshot = boards
+            self._snapshot_version = version
+            return True
+
+    def get_snapshot(self, name):
+        """
+        Returns a leaderboard result ("best_alltime", "best_today", "best_weekly",
+        "best_monthly" or "stats") without querying SQLite, unless new scores
+        were committed or the day changed since the last refresh.
+        """
+        self.flush()
+        with self.lock:
+            if self._snapshot_version != (self.get_version(), date.today()):
+                self._refresh_snapshot()
+            if name in self._snapshot:
+                return self._snapshot[name]
+            # Nothing could be read yet
+            return dict(EMPTY_STATS) if name == "stats" else {"Highscores": []}
+
+    def append_team(self, teamname, score):
+        """
+        Queues a new team score for the database.
+        Returns immediately; the writer thread does the INSERT and commit.
+        """
+        if not self.cur: return
+
+        finished_at = int(time.time())
+        self._write_q.put((teamname, score, finished_at))
+
+    def append_teams_bulk(self, rows: list[tuple[str, int, int]]):
+        """
+        Inserts many (teamname, score, finished_at) rows at once, e.g. to restore or seed
+        the leaderboard. finished_at is a unix timestamp.
+        """
+        if not self.cur or not rows: return
+
+        with self.lock:
+            try:
+                self._insert_rows(self.conn, rows)
+            except sqlite3.Error as e:
+                print(f"Error appending teams: {e}")
 
     def in_top10(self, score: int) -> bool:
         """Checks if a score is high enough for the top 10."""
-        if not self.cur: return False
-        
+        if not self.cur_ro: return False
+
+        # No flush(): this runs on the game's main thread, and the previous round's score was
+        # committed long before the next game over.
+
+        # data_version changes with every commit from any connection or process (e.g. a
+        # seeding script), so the cached cutoff is only re-read when it could have moved
+        version = self.get_version()
         try:
-            self.cur.execute(
-                "SELECT Punkte FROM Highscores ORDER BY Punkte DESC LIMIT 1 OFFSET 9"
-            )
-            row = self.cur.fetchone()
-            if row is None:
-                return True  # Database is not full, so it's in the top 10
-            return score > row[0]
+            if version is None or version != self._cutoff_version:
+                self._refresh_cutoff(version)
         except sqlite3.Error as e:
             print(f"Error checking top 10: {e}")
             return False
+        if self._cutoff_score is None:
+            return True  # Database is not full, so it's in the top 10
+        return score > self._cutoff_score
 
     def get_top_score(self) -> int:
         """Gets the single highest score from the database."""
-        if not self.cur: return 0
-        
+        if not self.cur_ro: return 0
+
+        # No flush(): the game tracks a score it just queued itself (see Game.reset_game)
         try:
-            self.cur.execute("SELECT MAX(Punkte) FROM Highscores")
-            result = self.cur.fetchone()
+            self.cur_ro.execute(SQL_TOP)
+            result = self.cur_ro.fetchone()
             return result[0] if result and result[0] is not None else 0
         except sqlite3.Error as e:
             print(f"Error getting top score: {e}")
             return 0
 
-    def get_best_alltime(self):
-        """Returns the top 10 scores of all time."""
-        if not self.cur: return {"Highscores": []}
-        
-        try:
-            self.cur.execute("SELECT * FROM Highscores ORDER BY Punkte DESC LIMIT 10")
-            game_data = self.cur.fetchall()
-            # Convert rows to dicts for JSON serialization
-            return {"Highscores": [dict(row) for row in game_data]}
-        except sqlite3.Error as e:
-            print(f"Error getting all-time best: {e}")
-            return {"Highscores": []}
+    def get_best_boards(self):
+        """
+        Returns the all-time, today, weekly (7 days) and monthly (31 days)
+        top 10 lists, fetched with a single query, or None if they could not be read.
+        """
+        if not self.cur_ro: return None
+
+        boards = {name: {"Highscores": []} for name in ("best_alltime", "best_today", "best_weekly", "best_monthly")}
 
-    def get_best_date(self, days_ago: int, offset: int):
-        """Returns top 10 scores from a specified date range."""
-        if not self.cur: return {"Highscores": []}
-        
         try:
-            query = f"SELECT * FROM Highscores WHERE date(Zeitpunkt) >= date('now', '-{days_ago} days') ORDER BY Punkte DESC LIMIT 10 OFFSET ?"
-            self.cur.execute(query, (offset,))
-            best_date = self.cur.fetchall()
-            return {"Highscores": [dict(row) for row in best_date]}
+            self.cur_ro.execute(SQL_BEST_BOARDS, (
+                "best_alltime",
+                "best_today", day_start(0),
+                "best_weekly", day_start(7),
+                "best_monthly", day_start(31),
+            ))
+            for (board, t, p, z) in self.cur_ro.fetchall():
+                boards[board]["Highscores"].append({"Teamname": t, "Punkte": p, "Zeitpunkt": z})
+            return boards
         except sqlite3.Error as e:
-            print(f"Error getting best by date: {e}")
-            return {"Highscores": []}
+            print(f"Error getting best boards: {e}")
+            return None
 
     def get_stats(self):
-        """Returns game count statistics."""
-        if not self.cur: return {}
+        """Returns game count statistics, or None if they could not be read."""
+        if not self.cur_ro: return None
 
-        default_results = {"Daily": 0, "Weekly": 0, "Monthly": 0, "AllTime": 0}
         try:
-            self.cur.execute(
-                """
-            SELECT
-                COUNT(*),
-                SUM(CASE WHEN date(Zeitpunkt) = date('now') THEN 1 ELSE 0 END),
-                SUM(CASE WHEN date(Zeitpunkt) >= date('now', '-6 days') THEN 1 ELSE 0 END),
-                SUM(CASE WHEN date(Zeitpunkt) >= date('now', '-29 days') THEN 1 ELSE 0 END) 
-            FROM Highscores
-                """
-            )
-            games_date = self.cur.fetchone()
+            self.cur_ro.execute(SQL_STATS, (day_start(0), day_start(6), day_start(29)))
+            games_date = self.cur_ro.fetchone()
             
             if games_date:
                 results = {
@@ -118,7 +352,7 @@ class DataBase:
                 }
                 return results
             else:
-                return default_results
+                return dict(EMPTY_STATS)
         except sqlite3.Error as e:
             print(f"Error getting stats: {e}")
-            return default_results
+            return None
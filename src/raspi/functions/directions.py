@@ -1,7 +1,7 @@
 import random
 import pygame
-from pygame.math import Vector2
-from typing import List
+from functools import lru_cache
+from typing import Sequence, Tuple
 
 RED = (225, 0, 0)
 BLUE = (0, 102, 255)
@@ -15,64 +15,74 @@ directions = ["LEFT", "DOWN", "UP", "RIGHT"]
 
 
 def reset_arrows():
-    global directions
-    directions = ["LEFT", "DOWN", "UP", "RIGHT"]
+    directions[:] = ["LEFT", "DOWN", "UP", "RIGHT"]
 
 
-def update_arrow_directions(vectors: List[Vector2]):
+def update_arrow_directions(vectors: Sequence[Tuple[int, int]]):
     """
-    Converts the vector list into a string list for the UI,
-    making sure to use integers for the dictionary lookup.
+    Converts the (dx, dy) direction list into a string list for the UI.
+    The game only ever passes the four unit directions.
     """
-    global directions
-    try:
-        directions = [directions_vectors[(int(v.x), int(v.y))] for v in vectors]
-    except KeyError as e:
-        print(f"Error: A vector direction was passed that is not in the dictionary: {e}")
-        directions = ["LEFT", "DOWN", "UP", "RIGHT"]
+    dv = directions_vectors
+    directions[:] = [dv[v] for v in vectors]
 
 
-def draw_direction_buttons(screen, screen_width, screen_height, cell_size):
+# Triangle corners per arrow, as multiples of the arrow size from the button center
+ARROW_OFFSETS = {
+    "LEFT": ((-1, 0), (1, -1), (1, 1)),  # left tip, top right, bottom right
+    "UP": ((0, -1), (-1, 1), (1, 1)),  # top tip, bottom left, bottom right
+    "DOWN": ((0, 1), (-1, -1), (1, -1)),  # bottom tip, top left, top right
+    "RIGHT": ((1, 0), (-1, -1), (-1, 1)),  # right tip, top left, bottom left
+}
+
+
+@lru_cache(maxsize=16)
+def arrow_points(direction, cx, cy, size):
+    """Returns the arrow triangle for a button; the geometry only changes with the screen layout."""
+    return tuple((cx + dx * size, cy + dy * size) for dx, dy in ARROW_OFFSETS[direction])
+
+
+@lru_cache(maxsize=8)
+def button_layout(screen_width, screen_height, cell_size):
+    """Returns the black margin rect, the four button rects and their centers."""
     margin_height = cell_size * 2
     margin_rect = pygame.Rect(
         0, screen_height - margin_height, screen_width, margin_height
     )
-    pygame.draw.rect(screen, (0, 0, 0), margin_rect)
 
     button_width = screen_width // 4
     button_height = margin_height - 10  # Etwas Abstand zum oberen Rand
 
+    rects = []
     for i in range(4):
         x = i * button_width + 5
         y = screen_height - button_height - 5
-        rect = pygame.Rect(x, y, button_width - 10, button_height)
-        pygame.draw.rect(screen, colors[i], rect, border_radius=10)
-        arrow_color = (255, 255, 255)
-        cx, cy = rect.center
-        size = cell_size * 0.6
-        
-        if directions[i] == "LEFT":
-            points = [
-                (cx - size, cy),  # left tip
-                (cx + size, cy - size),  # top right
-                (cx + size, cy + size),  # bottom right
-            ]
-        elif directions[i] == "UP":
-            points = [
-                (cx, cy - size),  # top tip
-                (cx - size, cy + size),  # bottom left
-                (cx + size, cy + size),  # bottom right
-            ]
-        elif directions[i] == "DOWN":
-            points = [
-                (cx, cy + size),  # bottom tip
-                (cx - size, cy - size),  # top left
-                (cx + size, cy - size),  # top right
-            ]
-        elif directions[i] == "RIGHT":
-            points = [
-                (cx + size, cy),  # right tip
-                (cx - size, cy - size),  # top left
-                (cx - size, cy + size),  # bottom left
-            ]
-        pygame.draw.polygon(screen, arrow_color, points)
+        rects.append(pygame.Rect(x, y, button_width - 10, button_height))
+    centers = tuple(rect.center for rect in rects)
+    return margin_rect, tuple(rects), centers
+
+
+@lru_cache(maxsize=32)
+def button_strip(screen_width, screen_height, cell_size, labels):
+    """
+    Renders the button strip for one arrow arrangement onto its own surface.
+    There are only 24 arrangements, so each is drawn at most once.
+    """
+    margin_rect, rects, centers = button_layout(screen_width, screen_height, cell_size)
+    strip = pygame.Surface(margin_rect.size)
+    strip.fill((0, 0, 0))
+
+    top = margin_rect.top
+    arrow_color = (255, 255, 255)
+    size = cell_size * 0.6
+    for i in range(4):
+        pygame.draw.rect(strip, colors[i], rects[i].move(0, -top), border_radius=10)
+        cx, cy = centers[i]
+        points = arrow_points(labels[i], cx, cy - top, size)
+        pygame.draw.polygon(strip, arrow_color, points)
+    return strip, margin_rect.topleft
+
+
+def draw_direction_buttons(screen, screen_width, screen_height, cell_size):
+    strip, pos = button_strip(screen_width, screen_height, cell_size, tuple(directions))
+    screen.blit(strip, pos)
@@ -2,22 +2,39 @@ import pygame
 import random
 from pygame.math import Vector2
 class FRUIT:
-    def __init__(self, screen, cell_size, apple_image,cell_number_x, cell_number_y):
+    MAX_SAMPLES = 32  # Random draws before falling back to a scan of the free cells
+
+    def __init__(self, screen, cell_size, apple_image,cell_number_x, cell_number_y, occupied=()):
         self.screen = screen 
         self.cell_size = cell_size 
         self.apple_image = apple_image
         self.cell_number_x = cell_number_x
 
         self.cell_number_y = cell_number_y
-        self.randomize()
+        self.randomize(occupied)
 
     def draw_fruit(self):
         r = pygame.Rect(int(self.position.x)*self.cell_size, int(self.position.y)*self.cell_size, self.cell_size, self.cell_size)
         self.screen.blit(self.apple_image, r)
 
-    def randomize(self):
-        self.x = random.randint(0, self.cell_number_x-1)
-        self.y = random.randint(4, self.cell_number_y-1)
+    def randomize(self, occupied=()):
+        # Rejection sampling: draw again until the cell is not covered by the snake.
+        # That is O(1) on average while most of the field is free; once the snake covers
+        # most of it, the placement falls back to picking from the free cells directly
+        for _ in range(self.MAX_SAMPLES):
+            self.x = random.randint(0, self.cell_number_x-1)
+            self.y = random.randint(4, self.cell_number_y-1)
+            if (self.x, self.y) not in occupied:
+                break
+        else:
+            free = [
+                (x, y)
+                for x in range(self.cell_number_x)
+                for y in range(4, self.cell_number_y)
+                if (x, y) not in occupied
+            ]
+            if free:  # With no free cell left the fruit stays under the snake
+                self.x, self.y = random.choice(free)
         self.position = Vector2(self.x, self.y)
 
         
@@ -1,6 +1,24 @@
 import pygame
+from dataclasses import dataclass
 from .database import DataBase
 
+
+@dataclass(frozen=True)
+class NameLayout:
+    """Geometry of the name input UI; depends only on the screen and cell size."""
+    char_width: float
+    spacing: float
+    total_name_width: float
+    ok_width: float
+    ok_spacing: float
+    block_width: float
+    x_start: float
+    char_y_center: float
+    ok_height: float
+    char_x_centers: tuple
+    ok_rect: pygame.Rect
+
+
 class NameInputManager:
     def __init__(self, db: DataBase, get_asset_path_func):
         self.db = db
@@ -8,6 +26,8 @@ class NameInputManager:
         
         self.active = False
         self.allowed_chars = "ABCDEFGHIJKLMNOPQRSTUVWXYZ1234567890"
+        self._char_idx = {c: i for i, c in enumerate(self.allowed_chars)}
+        self._chars_len = len(self.allowed_chars)
         self.name_length = 5
         self.player_name_chars = ["A"] * self.name_length
         self.current_focus_index = 0
@@ -21,6 +41,9 @@ class NameInputManager:
         self.input_delay = 20 
         
         self.fonts = {}
+        self._glyph_cache = {}
+        self._layout_key = None
+        self._layout = None
 
     def _load_fonts(self, cell_size):
         """Loads and caches fonts for the UI."""
@@ -38,8 +61,18 @@ class NameInputManager:
             ok_font = pygame.font.SysFont("Arial", int(cell_size * 1.0))
             
         self.fonts[cell_size] = (title_font, char_font, ok_font)
+        self._glyph_cache.clear()  # Surfaces were rendered with the previous fonts
         return self.fonts[cell_size]
 
+    def _render_cached(self, font, text, color):
+        """Renders text once per (font, text, color) and reuses the surface."""
+        key = (id(font), text, color)
+        surf = self._glyph_cache.get(key)
+        if surf is None:
+            surf = font.render(text, True, color).convert_alpha()
+            self._glyph_cache[key] = surf
+        return surf
+
     def activate(self, score_value):
         """Activates the name input screen."""
         self.active = True
@@ -55,15 +88,17 @@ class NameInputManager:
     def get_final_name(self):
         return self.final_entered_name
 
-    def handle_input(self, input_signal):
+    def handle_input(self, input_signal, now=None):
         """
         Processes key or button input.
+        now is the caller's frame time in ms; it is only queried from pygame if omitted.
         Returns a status string: "NAME_ENTERED", "ESC_PRESSED", "ACTION_TAKEN", or None.
         """
         if not self.active:
             return None
 
-        now = pygame.time.get_ticks()
+        if now is None:
+            now = pygame.time.get_ticks()
         if now - self.last_input_time < self.input_delay:
             return None  # Debounce
 
@@ -100,11 +135,9 @@ class NameInputManager:
         elif action in {"UP", "DOWN"}:
             if self.current_focus_index < self.name_length:
                 # Change character
-                char_idx = self.allowed_chars.find(self.player_name_chars[self.current_focus_index])
-                if action == "UP":
-                    char_idx = (char_idx - 1) % len(self.allowed_chars)
-                else: # DOWN
-                    char_idx = (char_idx + 1) % len(self.allowed_chars)
+                cur = self.player_name_chars[self.current_focus_index]
+                step = -1 if action == "UP" else 1 # DOWN
+                char_idx = (self._char_idx[cur] + step) % self._chars_len
                 self.player_name_chars[self.current_focus_index] = self.allowed_chars[char_idx]
                 return "ACTION_TAKEN"
             
@@ -134,34 +167,63 @@ class NameInputManager:
 
         return None
 
-    def draw(self, screen, screen_width, screen_height, cell_size):
-        """Draws the name input UI."""
-        if not self.active:
-            return
-
-        title_font, char_font, ok_font = self._load_fonts(cell_size)
+    def _compute_layout(self, screen_width, screen_height, cell_size):
+        """Computes the UI geometry, reusing the last result while the inputs are unchanged."""
+        key = (screen_width, screen_height, cell_size)
+        if key == self._layout_key:
+            return self._layout
 
-        title_surf = title_font.render("Teamnamen eingeben", True, (56, 74, 12))
-        title_rect = title_surf.get_rect(center=(screen_width / 2, screen_height / 2 - cell_size * 3.5))
-        screen.blit(title_surf, title_rect)
+        _, char_font, ok_font = self._load_fonts(cell_size)
 
         char_width = char_font.size("W")[0]
         spacing = cell_size // 1.5
         total_name_width = self.name_length * char_width + (self.name_length - 1) * spacing
-        
-        ok_text_surf = ok_font.render("OK", True, (56, 74, 12))
+
+        ok_text_surf = self._render_cached(ok_font, "OK", (56, 74, 12))
         ok_width = ok_text_surf.get_width() + cell_size
         ok_spacing = spacing * 1.5
 
         block_width = total_name_width + ok_spacing + ok_width
         x_start = screen_width / 2 - block_width / 2
-        x_offset = x_start
         char_y_center = screen_height / 2 - cell_size * 0.5
 
+        char_x_centers = tuple(
+            x_start + i * (char_width + spacing) + char_width / 2 for i in range(self.name_length)
+        )
+
+        example_height = self._render_cached(char_font, "A", (0, 0, 0)).get_height()
+        ok_height = example_height + cell_size * 0.5
+
+        ok_rect = pygame.Rect(
+            x_start + total_name_width + ok_spacing,
+            char_y_center - ok_height / 2,
+            ok_width,
+            ok_height,
+        )
+
+        self._layout = NameLayout(
+            char_width, spacing, total_name_width, ok_width, ok_spacing,
+            block_width, x_start, char_y_center, ok_height, char_x_centers, ok_rect,
+        )
+        self._layout_key = key
+        return self._layout
+
+    def draw(self, screen, screen_width, screen_height, cell_size):
+        """Draws the name input UI."""
+        if not self.active:
+            return
+
+        title_font, char_font, ok_font = self._load_fonts(cell_size)
+        layout = self._compute_layout(screen_width, screen_height, cell_size)
+
+        title_surf = self._render_cached(title_font, "Teamnamen eingeben", (56, 74, 12))
+        title_rect = title_surf.get_rect(center=(screen_width / 2, screen_height / 2 - cell_size * 3.5))
+        screen.blit(title_surf, title_rect)
+
         for i in range(self.name_length):
             char = self.player_name_chars[i]
-            char_surf = char_font.render(char, True, (56, 74, 12))
-            char_center = (x_offset + char_width / 2, char_y_center)
+            char_surf = self._render_cached(char_font, char, (56, 74, 12))
+            char_center = (layout.char_x_centers[i], layout.char_y_center)
             char_rect = char_surf.get_rect(center=char_center)
             screen.blit(char_surf, char_rect)
 
@@ -169,23 +231,9 @@ class NameInputManager:
                 underline = pygame.Rect(char_rect.left, char_rect.bottom + 2, char_rect.width, 4)
                 pygame.draw.rect(screen, (56, 74, 12), underline)
 
-            x_offset += char_width + spacing
-
-        x_offset -= spacing
-        x_offset += ok_spacing
-        
         ok_color = (167, 209, 61)
         text_color = (56, 74, 12)
-
-        example_height = char_font.render("A", True, (0, 0, 0)).get_height()
-        ok_height = example_height + cell_size * 0.5
-
-        ok_rect = pygame.Rect(
-            x_offset,
-            char_y_center - ok_height / 2,
-            ok_width,
-            ok_height,
-        )
+        ok_rect = layout.ok_rect
 
         if self.current_focus_index == self.ok_button_index:
             ok_color = (56, 74, 12)
@@ -193,6 +241,6 @@ class NameInputManager:
             pygame.draw.rect(screen, (255, 255, 255), ok_rect.inflate(6, 6), border_radius=7)
 
         pygame.draw.rect(screen, ok_color, ok_rect, border_radius=5)
-        ok_final_surf = ok_font.render("OK", True, text_color)
+        ok_final_surf = self._render_cached(ok_font, "OK", text_color)
         ok_text_rect = ok_final_surf.get_rect(center=ok_rect.center)
         screen.blit(ok_final_surf, ok_text_rect)
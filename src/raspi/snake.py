@@ -1,7 +1,7 @@
 #!/usr/bin/env python3
 import pygame
-from pygame.math import Vector2
 from enum import Enum, auto
+from functools import cached_property
 
 from functions.get_asset_path import get_asset_path
 from functions.body import SNAKE
@@ -27,8 +27,7 @@ class Game:
 
         self.info = pygame.display.Info()
         self.screen_width, self.screen_height = self.info.current_w, self.info.current_h
-        self.screen = pygame.display.set_mode((self.screen_width, self.screen_height), pygame.FULLSCREEN)
-        self.clock = pygame.time.Clock()
+        self.screen = self.create_display()
         self.running = True
          
         self.cell_size = 40
@@ -37,30 +36,72 @@ class Game:
         self.base_speed = 140
         self.min_speed = 75
         self.speed_increment = 5
+        # Tick interval per score; every score past the end of the table plays at min_speed
+        self._speed_by_score = tuple(
+            max(self.min_speed, self.base_speed - s * self.speed_increment)
+            for s in range((self.base_speed - self.min_speed) // self.speed_increment + 2)
+        )
         self.input_delay = 20
+        self._last_serial_poll = 0
 
         self.apple_image = self.load_image("assets/apple.png")
         self.apple_image_for_score = self.scale_image(self.apple_image, 0.8)
         self.crown_image = self.load_image("assets/crown.png")
         self.crown_image_for_score = self.scale_image(self.crown_image, 0.8)
+        # Score icons are scaled once here instead of every frame
+        score_icon_size = (int(self.cell_size * 1.5), int(self.cell_size * 1.5))
+        self.apple_score_final = pygame.transform.scale(self.apple_image_for_score, score_icon_size)
+        self.crown_score_final = pygame.transform.scale(self.crown_image_for_score, score_icon_size)
         self.game_font = self.load_font("Font/PoetsenOne-Regular.ttf", 0.8)
-        self.game_over_title_font = self.load_font("Font/PoetsenOne-Regular.ttf", 3.0)
-        self.game_over_msg_font = self.load_font("Font/PoetsenOne-Regular.ttf", 1.2)
+        # Rendered score boxes (bg rect, text, text and icon positions), keyed by score value
+        self._score_layout = {}
+        self._hs_layout = {}
+        # While playing only the cells touched by a tick are redrawn and pushed to the display;
+        # state changes, direction shuffles and name input request a full frame instead
+        self.background_color = (175, 215, 70)
+        self._full_redraw = True
+        self._dirty_cells = set()
+        self._fruit_cell = None
+        self._score_cells = ()
 
         self.db = DataBase()
+        self.top_score = 0
         self.name_manager = NameInputManager(self.db, get_asset_path)
         
-        self.start_vectors = [
-            Vector2(-1, 0),  # Index 0: LEFT
-            Vector2(0, 1),   # Index 1: DOWN
-            Vector2(0, -1),  # Index 2: UP
-            Vector2(1, 0),   # Index 3: RIGHT
-        ]
+        # Directions are plain (dx, dy) tuples. self.vectors is the one list that is
+        # shuffled and restored in place for the whole run
+        self.start_vectors = (
+            (-1, 0),  # Index 0: LEFT
+            (0, 1),   # Index 1: DOWN
+            (0, -1),  # Index 2: UP
+            (1, 0),   # Index 3: RIGHT
+        )
+        self.vectors = list(self.start_vectors)
         
+        # Key / serial command -> index into self.vectors (0: LEFT/Blue, 1: DOWN/Red, 2: UP/Green, 3: RIGHT/Yellow)
+        self._KEY_TO_DIR = {pygame.K_LEFT: 0, pygame.K_DOWN: 1, pygame.K_UP: 2, pygame.K_RIGHT: 3}
+        self._CMD_TO_DIR = {"LEFT": 0, "DOWN": 1, "UP": 2, "RIGHT": 3}
+
         self.SCREEN_UPDATE = pygame.USEREVENT
+        # Only these events are handled; SDL drops everything else (mouse motion etc.) at the source
+        self.handled_events = [pygame.QUIT, pygame.KEYDOWN, self.SCREEN_UPDATE]
+        pygame.event.set_blocked(None)
+        pygame.event.set_allowed(self.handled_events)
         
         self.reset_game()
 
+    def create_display(self):
+        """
+        Opens the fullscreen window through SDL2's accelerated presenter.
+        Falls back to a plain fullscreen surface where the driver can't provide vsync.
+        """
+        size = (self.screen_width, self.screen_height)
+        try:
+            return pygame.display.set_mode(size, pygame.FULLSCREEN | pygame.SCALED | pygame.DOUBLEBUF, vsync=1)
+        except pygame.error as e:
+            print(f"Warning: Accelerated display unavailable ({e}). Falling back to a plain fullscreen surface.")
+            return pygame.display.set_mode(size, pygame.FULLSCREEN)
+
     def load_image(self, path):
         """Helper to load and convert images."""
         return pygame.image.load(get_asset_path(path)).convert_alpha()
@@ -78,52 +119,100 @@ class Game:
             print(f"Warning: Font not found at {path}. Falling back to Arial.")
             return pygame.font.SysFont("Arial", int(self.cell_size * scale_factor))
 
+    # The game over fonts and texts are only loaded on the first game over
+    @cached_property
+    def game_over_title_font(self):
+        return self.load_font("Font/PoetsenOne-Regular.ttf", 3.0)
+
+    @cached_property
+    def game_over_msg_font(self):
+        return self.load_font("Font/PoetsenOne-Regular.ttf", 1.2)
+
+    @cached_property
+    def game_over_texts(self):
+        """The rendered game over texts with their positions; they never change."""
+        title = self.game_over_title_font.render("Game Over!", True, (190, 0, 0)).convert_alpha()
+        msg = self.game_over_msg_font.render("Drücke einen Knopf zum starten", True, (200, 200, 200)).convert_alpha()
+        title_rect = title.get_rect(center=(self.screen_width / 2, self.screen_height / 2 - self.cell_size * 2.5))
+        msg_rect = msg.get_rect(center=(self.screen_width / 2, self.screen_height / 2 + self.cell_size * 1.5))
+        return ((title, title_rect), (msg, msg_rect))
+
     def reset_game(self):
         """Resets the game to the initial state."""
-        self.vectors = self.start_vectors[:]
+        self.vectors[:] = self.start_vectors
         update_arrow_directions(self.vectors) # Syncs UI
         self.snake = SNAKE(self.screen, self.cell_size)
-        self.fruit = FRUIT(self.screen, self.cell_size, self.apple_image, self.cell_number_x, self.cell_number_y)
+        self.fruit = FRUIT(
+            self.screen, self.cell_size, self.apple_image, self.cell_number_x, self.cell_number_y, self.snake.occupied
+        )
         
         self.current_speed = self.base_speed
         pygame.time.set_timer(self.SCREEN_UPDATE, self.current_speed)
+        # Scores can only be added, so the high score never goes down. Keeping the local value
+        # covers a name just entered whose INSERT the writer thread has not committed yet
+        self.top_score = max(self.top_score, self.db.get_top_score())
         
         self.game_state = GameState.PLAYING
+        self._full_redraw = True
         self.name_manager.deactivate()
-        self.new_direction = Vector2(1, 0) # Start moving right
+        self.new_direction = (1, 0) # Start moving right
         self.last_input_time = 0
 
     def run(self):
         """Main game loop."""
         while self.running:
-            self.handle_events()
+            # Sleep until an event arrives or the next serial poll is due instead of
+            # waking up 60 times a second; render() only redraws what has changed
+            first_event = pygame.event.wait(self.next_poll_timeout())
+            self.handle_events(first_event)
             self.render()
-            self.clock.tick(60)
         
         self.db.close()
         pygame.quit()
 
-    def handle_events(self):
-        """Processes all pygame events and serial input."""
+    def next_poll_timeout(self):
+        """Returns the ms until handle_events will poll the serial port again (at least 1)."""
+        due = max(self._last_serial_poll + self.current_speed // 2, self.last_input_time + self.input_delay)
+        return max(1, due - pygame.time.get_ticks())
+
+    def handle_events(self, first_event=None):
+        """Processes all pygame events and serial input; first_event is one already taken off the queue."""
         current_time_ms = pygame.time.get_ticks()
         processed_action_this_frame = False
 
-        for event in pygame.event.get():
+        events = pygame.event.get(self.handled_events)
+        if first_event is not None and first_event.type != pygame.NOEVENT:
+            events.insert(0, first_event)
+
+        # Input is handled before the ticks of the same batch, so a tick always
+        # moves the snake in the most recently chosen direction
+        pending_ticks = 0
+        for event in events:
             if event.type == pygame.QUIT:
                 self.running = False
 
             if event.type == self.SCREEN_UPDATE:
-                self.handle_screen_update()
+                pending_ticks += 1
 
             if event.type == pygame.KEYDOWN:
                 if current_time_ms - self.last_input_time >= self.input_delay:
                     processed_action_this_frame = self.handle_keydown(event.key, current_time_ms)
         
-        if not processed_action_this_frame and (current_time_ms - self.last_input_time >= self.input_delay):
+        # A direction change only takes effect on the next tick, so the serial port
+        # is polled twice per tick instead of every frame
+        if (
+            not processed_action_this_frame
+            and current_time_ms - self.last_input_time >= self.input_delay
+            and current_time_ms - self._last_serial_poll >= self.current_speed // 2
+        ):
+            self._last_serial_poll = current_time_ms
             button_command = read_button_input()
             if button_command:
                 self.handle_button_input(button_command, current_time_ms)
 
+        for _ in range(pending_ticks):
+            self.handle_screen_update()
+
     def handle_screen_update(self):
         """Handles the game logic update tied to the custom timer."""
         if self.game_state == GameState.PLAYING:
@@ -134,9 +223,13 @@ class Game:
         """Dispatches keydown events based on game state."""
         action_taken = False
         if self.game_state == GameState.NAME_INPUT:
-            result = self.name_manager.handle_input(key)
+            result = self.name_manager.handle_input(key, current_time_ms)
             if result:
                 action_taken = True
+                self._full_redraw = True
+                if result == "NAME_ENTERED":
+                    # The score is committed in the background, so the high score is updated here
+                    self.top_score = max(self.top_score, self.name_manager.current_score)
                 if result in ("NAME_ENTERED", "ESC_PRESSED"):
                     print(f"Player: {self.name_manager.get_final_name()} | Score: {self.name_manager.current_score}")
                     self.reset_game()
@@ -157,64 +250,49 @@ class Game:
 
     def handle_playing_keydown(self, key):
         """Handles key presses during the 'PLAYING' state."""
-        current_direction = self.snake.direction
-        potential_new_direction = None
-        action_taken = True
-        
-        if key == pygame.K_LEFT:
-            potential_new_direction = self.vectors[0] # Index 0: LEFT
-        elif key == pygame.K_DOWN:
-            potential_new_direction = self.vectors[1] # Index 1: DOWN
-        elif key == pygame.K_UP:
-            potential_new_direction = self.vectors[2] # Index 2: UP
-        elif key == pygame.K_RIGHT:
-            potential_new_direction = self.vectors[3] # Index 3: RIGHT
-        elif key == pygame.K_ESCAPE:
-            self.running = False
-            return True 
-        else:
-            action_taken = False
-            return False 
-        
-        if potential_new_direction and potential_new_direction + current_direction != Vector2(0, 0):
+        idx = self._KEY_TO_DIR.get(key)
+        if idx is None:
+            if key == pygame.K_ESCAPE:
+                self.running = False
+                return True
+            return False
+
+        return self._try_set_direction(idx)
+
+    def _try_set_direction(self, idx):
+        """
+        Queues self.vectors[idx] as the next direction unless it points straight back.
+        Returns whether the turn was accepted.
+        """
+        potential_new_direction = self.vectors[idx]
+        pdx, pdy = potential_new_direction
+        cdx, cdy = self.snake.direction
+        # The components cancel out only for the reverse direction
+        if pdx + cdx or pdy + cdy:
             self.new_direction = potential_new_direction
-        else:
-            action_taken = False 
-
-        return action_taken
+            return True
+        return False
 
     def handle_button_input(self, command, current_time_ms):
         """Dispatches serial button commands based on game state."""
         action_taken = False
         if self.game_state == GameState.NAME_INPUT:
-            result = self.name_manager.handle_input(command)
+            result = self.name_manager.handle_input(command, current_time_ms)
             if result:
                 action_taken = True
+                self._full_redraw = True
+                if result == "NAME_ENTERED":
+                    # The score is committed in the background, so the high score is updated here
+                    self.top_score = max(self.top_score, self.name_manager.current_score)
                 if result in ("NAME_ENTERED", "ESC_PRESSED"):
                     print(f"Player: {self.name_manager.get_final_name()} | Score: {self.name_manager.current_score}")
                     self.reset_game()
 
         elif self.game_state == GameState.PLAYING:
-            current_direction = self.snake.direction
-            potential_new_direction = None
-            action_taken = True
-            
-            if command == "LEFT":
-                potential_new_direction = self.vectors[0] # Index 0: LEFT (Blue)
-            elif command == "DOWN":
-                potential_new_direction = self.vectors[1] # Index 1: DOWN (Red)
-            elif command == "UP":
-                potential_new_direction = self.vectors[2] # Index 2: UP (Green)
-            elif command == "RIGHT":
-                potential_new_direction = self.vectors[3] # Index 3: RIGHT (Yellow)
-            else:
-                action_taken = False
-            
-            if potential_new_direction and potential_new_direction + current_direction != Vector2(0, 0):
-                self.new_direction = potential_new_direction
-            else:
-                action_taken = False 
-        
+            idx = self._CMD_TO_DIR.get(command)
+            if idx is not None:
+                action_taken = self._try_set_direction(idx)
+
         elif self.game_state == GameState.GAME_OVER:
             self.reset_game()
             action_taken = True
@@ -224,44 +302,46 @@ class Game:
 
     def update_game_logic(self):
         """Updates snake movement and checks for collisions."""
-        self.snake.move_snake(self.cell_number_x, self.cell_number_y)
+        vacated = self.snake.move_snake(self.cell_number_x, self.cell_number_y)
         self.check_fruit_collision()
         self.check_fail_collision()
 
+        # The new head, the old head (now a body segment) and the new tail change their graphics
+        body = self.snake.body
+        self._dirty_cells.update((body[0], body[1], body[-1]))
+        if vacated is not None:
+            self._dirty_cells.add(vacated)
+
     def check_fruit_collision(self):
         """Checks for fruit collision and updates game accordingly."""
         if self.fruit.position == self.snake.body[0]:
-            self.fruit.randomize()
+            self.fruit.randomize(self.snake.occupied)
             self.snake.add_block()
             score = len(self.snake.body) - 2
             if score % 5 == 0 and score != 0:
                 print(f"Score: {score}. Shuffling directions!")
-                self.vectors = shuffle_list(self.start_vectors[:])
+                shuffle_list(self.vectors)
                 update_arrow_directions(self.vectors)
-            
-            for b in self.snake.body:
-                if self.fruit.position == b:
-                    self.fruit.randomize()
-            
+                self._full_redraw = True
+
             self.update_speed()
 
     def check_fail_collision(self):
-        """Checks for wall or self collision."""
-        head = self.snake.body[0]
-        # Check wall collision
-        if not (0 <= head.x < self.cell_number_x and 0 <= head.y < self.cell_number_y):
+        """Checks for self collision."""
+        # There are no walls: move_snake wraps the head around the field edges, so the head
+        # is always inside the grid. Self collision was looked up in the occupied set during the move
+        if self.snake.self_collision:
             self.game_over()
-        # Check self collision
-        for b in self.snake.body[1:]:
-            if b == head:
-                self.game_over()
 
     def game_over(self):
         """Handles the game over logic."""
         self.game_state = GameState.GAME_OVER
+        self._full_redraw = True
+        # Ticks only matter while playing; reset_game starts the timer again
+        pygame.time.set_timer(self.SCREEN_UPDATE, 0)
         current_score_val = len(self.snake.body) - 3
         
-        self.vectors = self.start_vectors[:] 
+        self.vectors[:] = self.start_vectors
         update_arrow_directions(self.vectors)
 
         if self.db.in_top10(current_score_val):
@@ -271,7 +351,7 @@ class Game:
     def update_speed(self):
         """Increases game speed based on snake length."""
         score = len(self.snake.body) - 3
-        new_speed = max(self.min_speed, self.base_speed - (score * self.speed_increment))
+        new_speed = self._speed_by_score[min(score, len(self._speed_by_score) - 1)]
         if new_speed != self.current_speed:
             self.current_speed = new_speed
             pygame.time.set_timer(self.SCREEN_UPDATE, self.current_speed)
@@ -279,15 +359,22 @@ class Game:
     def render(self):
         """Renders all game elements based on the current state."""
         
+        if self.game_state == GameState.PLAYING and not self._full_redraw:
+            self.render_dirty_cells()
+            return
+        if not self._full_redraw:
+            return  # The game over and name input screens only change on input
+
         if self.game_state == GameState.PLAYING:
-            self.screen.fill((175, 215, 70))
+            self.screen.fill(self.background_color)
             self.fruit.draw_fruit()
             self.snake.draw_snake()
-            self.draw_score()
-            self.draw_highscore()
+            self._score_cells = self.cells_under(self.draw_score()) + self.cells_under(self.draw_highscore())
+            self._fruit_cell = self.fruit_cell()
+            self._dirty_cells.clear()
 
         elif self.game_state == GameState.NAME_INPUT:
-            self.screen.fill((175, 215, 70))
+            self.screen.fill(self.background_color)
             self.name_manager.draw(
                 self.screen, self.screen_width, self.screen_height, self.cell_size
             )
@@ -297,25 +384,75 @@ class Game:
 
         draw_direction_buttons(self.screen, self.screen_width, self.screen_height, self.cell_size)
         pygame.display.update()
+        self._full_redraw = False
+
+    def render_dirty_cells(self):
+        """Redraws only the cells changed since the last frame and updates just those areas."""
+        fruit_cell = self.fruit_cell()
+        if fruit_cell != self._fruit_cell:
+            self._dirty_cells.add(self._fruit_cell)
+            self._dirty_cells.add(fruit_cell)
+            self._fruit_cell = fruit_cell
+        if not self._dirty_cells:
+            return  # Nothing moved since the last frame
+
+        # The score boxes can shrink when the text gets narrower, so the field under
+        # them is restored before they are drawn again on top of it
+        self._dirty_cells.update(self._score_cells)
+        cs = self.cell_size
+        rects = [pygame.Rect(x * cs, y * cs, cs, cs) for x, y in self._dirty_cells]
+        for r in rects:
+            self.screen.fill(self.background_color, r)
+        if fruit_cell in self._dirty_cells:
+            self.fruit.draw_fruit()
+        self.snake.draw_snake(self._dirty_cells)
+        # The score boxes are drawn on top of the playing field, so they are always repainted
+        score_rect = self.draw_score()
+        highscore_rect = self.draw_highscore()
+        rects.append(score_rect)
+        rects.append(highscore_rect)
+        self._score_cells = self.cells_under(score_rect) + self.cells_under(highscore_rect)
+
+        pygame.display.update(rects)
+        self._dirty_cells.clear()
+
+    def cells_under(self, rect):
+        """Returns the grid cells a screen rect overlaps."""
+        cs = self.cell_size
+        return tuple(
+            (x, y)
+            for x in range(rect.left // cs, (rect.right - 1) // cs + 1)
+            for y in range(rect.top // cs, (rect.bottom - 1) // cs + 1)
+        )
+
+    def fruit_cell(self):
+        """Returns the fruit position as an (x, y) int tuple."""
+        pos = self.fruit.position
+        return (int(pos[0]), int(pos[1]))
 
     def render_game_over_screen(self):
         """Renders the 'Game Over' message."""
         self.screen.fill((0, 0, 0))
         
-        ts = self.game_over_title_font.render("Game Over!", True, (190, 0, 0))
-        isf_text = "Drücke einen Knopf zum starten"
-        isf = self.game_over_msg_font.render(isf_text, True, (200, 200, 200))
+        for surf, rect in self.game_over_texts:
+            self.screen.blit(surf, rect)
 
-        tr = ts.get_rect(center=(self.screen_width / 2, self.screen_height / 2 - self.cell_size * 2.5))
-        ir = isf.get_rect(center=(self.screen_width / 2, self.screen_height / 2 + self.cell_size * 1.5))
+    def draw_score(self):
+        """Draws the current game score and returns the area it covers."""
+        score = len(self.snake.body) - 3
+        layout = self._score_layout.get(score)
+        if layout is None:
+            layout = self._score_layout[score] = self.score_layout(score)
+        bg, surf, surf_pos, icon_pos = layout
 
-        self.screen.blit(ts, tr)
-        self.screen.blit(isf, ir)
+        pygame.draw.rect(self.screen, (167, 209, 61), bg, border_radius=5)
+        self.screen.blit(surf, surf_pos)
+        self.screen.blit(self.apple_score_final, icon_pos)
+        return bg
 
-    def draw_score(self):
-        """Draws the current game score."""
-        s = str(len(self.snake.body) - 3)
-        surf = self.game_font.render(s, True, (56, 74, 12))
+    def score_layout(self, score):
+        """Renders the score box contents once; returns (bg, text, text_pos, icon_pos)."""
+        surf = self.game_font.render(str(score), True, (56, 74, 12)).convert_alpha()
         sx = self.screen_width - (self.cell_size * 2.5)
         sy = self.cell_size * 1.5
         rect = surf.get_rect(center=(sx, sy))
@@ -324,38 +461,37 @@ class Game:
         bg = pygame.Rect(0, 0, bg_rect_width + 40, rect.height + 30)
         bg.midright = (self.screen_width - self.cell_size * 0.5, rect.centery)
 
-        pygame.draw.rect(self.screen, (167, 209, 61), bg, border_radius=5)
-        self.screen.blit(surf, surf.get_rect(midright=(bg.right - 10, bg.centery)))
-        
-        apple_width = int(self.cell_size * 1.5)
-        apple_height = int(self.cell_size * 1.5)
-        scaled_apple = pygame.transform.scale(self.apple_image_for_score, (apple_width, apple_height))
-        ar = scaled_apple.get_rect(midright=(bg.left + scaled_apple.get_width() + 10, bg.centery))
-        self.screen.blit(scaled_apple, ar)
+        surf_pos = surf.get_rect(midright=(bg.right - 10, bg.centery)).topleft
+        ar = self.apple_score_final.get_rect(midright=(bg.left + self.apple_score_final.get_width() + 10, bg.centery))
+        return bg, surf, surf_pos, ar.topleft
 
     def draw_highscore(self):
-        """Draws the all-time high score."""
+        """Draws the all-time high score and returns the area it covers."""
+        layout = self._hs_layout.get(self.top_score)
+        if layout is None:
+            layout = self._hs_layout[self.top_score] = self.highscore_layout(self.top_score)
+        bg, surf, surf_pos, icon_pos = layout
+
+        pygame.draw.rect(self.screen, (167, 209, 61), bg, border_radius=5)
+        self.screen.blit(surf, surf_pos)
+        self.screen.blit(self.crown_score_final, icon_pos)
+        return bg
+
+    def highscore_layout(self, score):
+        """Renders the high score box contents once; returns (bg, text, text_pos, icon_pos)."""
         x = self.cell_size * 1.5
         y = self.cell_size * 1.5
 
-        top_score = self.db.get_top_score()
-        score_str = str(top_score)
-
-        surf = self.game_font.render(score_str, True, (56, 74, 12))
+        surf = self.game_font.render(str(score), True, (56, 74, 12)).convert_alpha()
         rect = surf.get_rect(center=(x, y))
 
         bg_rect_width = surf.get_width() + self.cell_size
         bg = pygame.Rect(0, 0, bg_rect_width + 40, rect.height + 30)
         bg.midleft = (x, y)
 
-        pygame.draw.rect(self.screen, (167, 209, 61), bg, border_radius=5)
-        self.screen.blit(surf, surf.get_rect(midleft=(bg.left + 10, bg.centery)))
-
-        crown_width = int(self.cell_size * 1.5)
-        crown_height = int(self.cell_size * 1.5)
-        scaled_crown = pygame.transform.scale(self.crown_image_for_score, (crown_width, crown_height))
-        ar = scaled_crown.get_rect(midright=(bg.right - 10, bg.centery))
-        self.screen.blit(scaled_crown, ar)
+        surf_pos = surf.get_rect(midleft=(bg.left + 10, bg.centery)).topleft
+        ar = self.crown_score_final.get_rect(midright=(bg.right - 10, bg.centery))
+        return bg, surf, surf_pos, ar.topleft
 
 
 if __name__ == "__main__":